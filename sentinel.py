@@ -20,6 +20,12 @@
 #                         image dimensions (recommended: 320x240 or 640x480).
 #                         Default: 320x240
 #   -v, --verbose         detailed output, including timing information
+#   --record=FILE         record the session to FILE for later analysis
+#   --record-size=MB      space preallocated for the session recording. Default: 256
+#   --replay=FILE         replay a recorded session through face detection and aiming
+#   --replay-start=SECONDS
+#                         seconds into the recorded session to start replaying from.
+#                         Default: 0
 
 import os
 import sys
@@ -30,11 +36,66 @@ import subprocess
 import shutil
 import math
 import threading
+import mmap
+import struct
+import bisect
+import numpy
 from optparse import OptionParser
 
 # globals
 FNULL = open(os.devnull, 'w')
 
+# session recording format: a fixed header followed by append-only records,
+# each of which is a (kind, timestamp, payload length) triple and its payload
+SESSION_MAGIC = 'SNTLREC1'
+SESSION_HEADER = struct.Struct('<8sHHHHddBBBBQ')  # magic, image w/h, frame w/h, x/y speed, L/R/U/D, end offset
+SESSION_RECORD = struct.Struct('<BdI')
+SESSION_END_OFFSET = SESSION_HEADER.size - 8  # position of the end offset within the header
+RECORD_FRAME, RECORD_FACES, RECORD_TARGET, RECORD_COMMAND = range(4)
+LAUNCHER_COMMANDS = ('turretUp', 'turretDown', 'turretLeft', 'turretRight', 'turretDirection',
+                     'turretStop', 'turretFire', 'ledOn', 'ledOff')
+
+
+# monotonic clock for session timestamps (python 2 has no time.monotonic), chosen on first use
+# so that the system libraries it needs are only loaded when a session is recorded
+def monotonic():
+    global monotonic
+    monotonic = monotonic_clock()
+    return monotonic()
+
+def monotonic_clock():
+    if sys.platform == 'win32':
+        return time.clock  # wall-clock time since first call, from QueryPerformanceCounter
+    try:
+        import ctypes, ctypes.util
+        if sys.platform.startswith('linux'):
+            class timespec(ctypes.Structure):
+                _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+            librt = ctypes.CDLL(ctypes.util.find_library('rt') or 'librt.so.1')
+            CLOCK_MONOTONIC = 1
+
+            def clock_gettime():
+                t = timespec()
+                librt.clock_gettime(CLOCK_MONOTONIC, ctypes.byref(t))
+                return t.tv_sec + t.tv_nsec * 1e-9
+            return clock_gettime
+        elif sys.platform == 'darwin':
+            class mach_timebase_info_data_t(ctypes.Structure):
+                _fields_ = [('numer', ctypes.c_uint32), ('denom', ctypes.c_uint32)]
+
+            libc = ctypes.CDLL(ctypes.util.find_library('c'))
+            libc.mach_absolute_time.restype = ctypes.c_uint64
+            timebase = mach_timebase_info_data_t()
+            libc.mach_timebase_info(ctypes.byref(timebase))
+
+            def mach_absolute_time():
+                return libc.mach_absolute_time() * timebase.numer / float(timebase.denom) * 1e-9
+            return mach_absolute_time
+    except (OSError, AttributeError):
+        pass
+    return time.time  # may step backwards, so Recorder keeps timestamps from decreasing
+
 
 # http://stackoverflow.com/questions/4984647/accessing-dict-keys-like-an-attribute-in-python
 class AttributeDict(dict):
@@ -256,14 +317,18 @@ class Launcher2123(Launcher):
  
 
 class Turret():
-    def __init__(self, opts):
+    def __init__(self, opts, launcher=None, recorder=None):
         self.opts = opts
 
         # Choose correct Launcher
-        if opts.launcherID == "1130":
+        if launcher:
+            self.launcher = launcher
+        elif opts.launcherID == "1130":
             self.launcher = Launcher1130();
         else:
             self.launcher = Launcher2123();
+        if recorder:
+            recorder.attach(self.launcher)
 
         self.missiles_remaining = self.launcher.missile_capacity
         self.origin_x, self.origin_y = map(float, opts.origin.split(','))
@@ -292,8 +357,8 @@ class Turret():
     def center(self):
         self.launcher.center(self.origin_x, self.origin_y)
 
-    # adjusts the turret's position (units are fairly arbitary but work ok)
-    def adjust(self, right_dist, down_dist):
+    # works out how to adjust the turret's position, as a list of (direction, seconds) movements
+    def plan_adjust(self, right_dist, down_dist):
         right_seconds = right_dist * self.launcher.x_speed
         down_seconds = down_dist * self.launcher.y_speed
 
@@ -309,19 +374,19 @@ class Turret():
         elif down_seconds < 0:
             directionDown = self.launcher.UP
 
-        #move diagonally first
-        self.launcher.turretDirection(directionDown | directionRight) 
-
-        #move remaining distance in one direction
+        #move diagonally first, then move remaining distance in one direction
         if (abs(right_seconds)>abs(down_seconds)):
-            time.sleep(abs(down_seconds))
-            self.launcher.turretDirection(directionRight)
-            time.sleep(abs(right_seconds-down_seconds))            
+            return [(directionDown | directionRight, abs(down_seconds)),
+                    (directionRight, abs(right_seconds-down_seconds))]
         else:
-            time.sleep(abs(right_seconds))
-            self.launcher.turretDirection(directionDown)
-            time.sleep(abs(down_seconds-right_seconds))          
-        
+            return [(directionDown | directionRight, abs(right_seconds)),
+                    (directionDown, abs(down_seconds-right_seconds))]
+
+    # adjusts the turret's position (units are fairly arbitary but work ok)
+    def adjust(self, right_dist, down_dist):
+        for direction, seconds in self.plan_adjust(right_dist, down_dist):
+            self.launcher.turretDirection(direction)
+            time.sleep(seconds)
         self.launcher.turretStop()
 
         # OpenCV takes pictures VERY quickly, so if we use it, we must
@@ -369,10 +434,14 @@ class Turret():
             print "size of target: %.6f" % target_y_size
             print "compensation amount: %.6f" % adjust_amount
 
+    # whether a detected face is close enough to the center of the sights to fire upon
+    def is_locked_on(self, x_adj, y_adj, face_detected):
+        return face_detected and abs(x_adj) < .05 and abs(y_adj) < .05
+
     # turn on LED if face detected in range, and fire missiles if armed
     def ready_aim_fire(self, x_adj, y_adj, target_y_size, face_detected, camera=None):
         fired = False
-        if face_detected and abs(x_adj) < .05 and abs(y_adj) < .05:
+        if self.is_locked_on(x_adj, y_adj, face_detected):
             turret.launcher.ledOn()  # LED will turn on when target is locked
             if self.opts.armed:
                 # aim a little higher if our target is in the distance
@@ -454,11 +523,8 @@ class Camera():
         self.resolution_set = self.webcam.set(cv2.cv.CV_CAP_PROP_FRAME_WIDTH,img_w)
         self.resolution_set =  self.resolution_set  and self.webcam.set(cv2.cv.CV_CAP_PROP_FRAME_HEIGHT,img_h)
 
-
-        # initialize classifier with training set of faces
-        self.face_filter = cv2.CascadeClassifier(self.opts.haar_file)
-        if (opts.profile):
-            self.profile_filter = cv2.CascadeClassifier(self.opts.haar_profile_file)            
+        self.load_filters()
+        self.recorder = None  # set to a Recorder to record each frame and its detection results
 
         # create a separate thread to grab frames from camera.  This prevents a frame buffer from filling up with old images
         self.camThread = threading.Thread(target=self.grab_frames)
@@ -467,6 +533,12 @@ class Camera():
         self.new_frame_available = False
         self.camThread.start()
 
+    # initialize classifier with training set of faces
+    def load_filters(self):
+        self.face_filter = cv2.CascadeClassifier(self.opts.haar_file)
+        if (self.opts.profile):
+            self.profile_filter = cv2.CascadeClassifier(self.opts.haar_profile_file)
+
     # turn off camera properly
     def dispose(self):
         if sys.platform == 'linux2' or sys.platform == 'darwin':
@@ -524,6 +596,8 @@ class Camera():
 
         #convert to grayscale since haar operates on grayscale images anyways
         img = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        if self.recorder:
+            self.recorder.frame(img)
 
         # detect faces (might want to make the minNeighbors threshold adjustable)
         faces = self.face_filter.detectMultiScale(img, minNeighbors=4)
@@ -549,6 +623,8 @@ class Camera():
 
         # sort by size of face (we use the last face for computing x_adj, y_adj)
         faces.sort(key=lambda face: face[2]*face[3])
+        if self.recorder:
+            self.recorder.faces(faces)
 
         x_adj, y_adj = (0, 0)  # (x,y)-distance from center, as a fraction of image dimensions
         face_y_size = 0  # height of the detected face, used to gauge distance to target
@@ -567,7 +643,8 @@ class Camera():
             face_y_size = h / float(img_h)
         else:
             face_detected = False
-
+        if self.recorder:
+            self.recorder.target(face_detected, x_adj, y_adj, face_y_size)
 
         #store modified image as class variable so that display() can access it
         self.frame_mod = img
@@ -584,10 +661,241 @@ class Camera():
             # delay of 2 ms for refreshing screen (time.sleep() doesn't work)
             cv2.waitKey(2)
 
-if __name__ == '__main__':
-    if (sys.platform == 'linux2' or sys.platform == 'darwin') and not os.geteuid() == 0:
-        sys.exit("Script must be run as root.")
 
+# Records camera frames, detection results and launcher commands to a memory-mapped session file.
+# The file is preallocated, and the end offset in its header is updated after every record, so that
+# writing a record is just a copy into memory and a session cut short by a crash can still be read.
+class Recorder():
+    frame_scale = 0.5  # frames are stored downscaled to keep recordings compact
+
+    def __init__(self, filename, size, image_dimensions):
+        self.img_w, self.img_h = map(int, image_dimensions.split('x'))
+        self.frame_w = int(self.img_w * self.frame_scale)
+        self.frame_h = int(self.img_h * self.frame_scale)
+        self.full = False
+        self.last_timestamp = 0
+        if size < SESSION_HEADER.size + SESSION_RECORD.size + self.frame_w * self.frame_h:
+            raise ValueError('Session recording size of %d bytes is too small to hold a single frame.' % size)
+
+        # write the whole file out up front, so that no disk space has to be allocated while
+        # recording (running out of space behind a memory-mapped file kills the process)
+        print 'Preallocating session recording ...'
+        self.file = open(filename, 'w+b')
+        try:
+            chunk = '\0' * (1024 * 1024)
+            for i in xrange(size // len(chunk)):
+                self.file.write(chunk)
+            self.file.write(chunk[:size % len(chunk)])
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        except (IOError, OSError), e:
+            self.file.close()
+            raise ValueError('Unable to preallocate session recording: ' + str(e))
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.offset = SESSION_HEADER.size
+        self.calibration = (0, 0, 0, 0, 0, 0)  # launcher x/y speed and L/R/U/D, filled in by attach()
+        self.write_header()
+
+    def write_header(self):
+        SESSION_HEADER.pack_into(self.map, 0, SESSION_MAGIC, self.img_w, self.img_h, self.frame_w, self.frame_h,
+                                 *(self.calibration + (self.offset,)))
+
+    # record the launcher's calibration, and all commands sent to it from now on
+    def attach(self, launcher):
+        self.calibration = (launcher.x_speed, launcher.y_speed,
+                            launcher.LEFT, launcher.RIGHT, launcher.UP, launcher.DOWN)
+        self.write_header()
+
+        # shadowing the commands on the launcher instance also catches those
+        # issued by the movement routines of the Launcher parent class
+        for code, name in enumerate(LAUNCHER_COMMANDS):
+            setattr(launcher, name, self.recorded_command(code, getattr(launcher, name)))
+
+    def recorded_command(self, code, command):
+        def run_command(*args):
+            self.append(RECORD_COMMAND, struct.pack('<Bi', code, args[0] if args else 0))
+            command(*args)
+        return run_command
+
+    def append(self, kind, payload):
+        # once a record has not fit, stop for good so the session ends at one consistent point
+        if self.full:
+            return
+        end = self.offset + SESSION_RECORD.size + len(payload)
+        if end > len(self.map):
+            print 'Session recording is full, no longer recording.'
+            self.full = True
+            return
+        # timestamps must never decrease, since SessionReader seeks through them by bisection
+        self.last_timestamp = max(self.last_timestamp, monotonic())
+        SESSION_RECORD.pack_into(self.map, self.offset, kind, self.last_timestamp, len(payload))
+        self.map[self.offset + SESSION_RECORD.size:end] = payload
+        self.offset = end
+        struct.pack_into('<Q', self.map, SESSION_END_OFFSET, end)
+
+    # stores a downscaled copy of a grayscale frame
+    def frame(self, img):
+        frame = cv2.resize(img, (self.frame_w, self.frame_h), interpolation=cv2.INTER_AREA)
+        self.append(RECORD_FRAME, frame.tostring())
+
+    def faces(self, faces):
+        self.append(RECORD_FACES, struct.pack('<%di' % (4 * len(faces)), *sum(faces, [])))
+
+    def target(self, face_detected, x_adj, y_adj, face_y_size):
+        self.append(RECORD_TARGET, struct.pack('<?ddd', face_detected, x_adj, y_adj, face_y_size))
+
+    # write the recording out and trim the unused preallocated space
+    def close(self):
+        self.map.flush()
+        self.map.close()
+        self.file.truncate(self.offset)
+        self.file.close()
+
+
+# Reads a session file written by Recorder, indexing its records by timestamp
+class SessionReader():
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        if os.fstat(self.file.fileno()).st_size < SESSION_HEADER.size:
+            raise ValueError('Not a session recording: ' + filename)
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = SESSION_HEADER.unpack_from(self.map, 0)
+        if header[0] != SESSION_MAGIC:
+            raise ValueError('Not a session recording: ' + filename)
+        self.image_dimensions = '%dx%d' % header[1:3]
+        self.frame_w, self.frame_h = header[3:5]
+        self.x_speed, self.y_speed = header[5:7]
+        self.LEFT, self.RIGHT, self.UP, self.DOWN = header[7:11]
+        end = min(header[11], len(self.map))
+
+        # index of record timestamps and offsets, for seeking. After a crash the end offset may have
+        # reached the disk before the records did, so the index stops at the first invalid record.
+        self.timestamps = []
+        self.offsets = []
+        offset = SESSION_HEADER.size
+        while offset < end:
+            if not self.valid_record(offset, end):
+                print 'Session recording is truncated at offset %d, ignoring the rest.' % offset
+                break
+            kind, timestamp, length = SESSION_RECORD.unpack_from(self.map, offset)
+            self.timestamps.append(timestamp)
+            self.offsets.append(offset)
+            offset += SESSION_RECORD.size + length
+        self.start_time = self.timestamps[0] if self.timestamps else 0
+
+    # whether the record at offset is complete and well-formed, and continues the index in time order
+    def valid_record(self, offset, end):
+        if offset + SESSION_RECORD.size > end:
+            return False
+        kind, timestamp, length = SESSION_RECORD.unpack_from(self.map, offset)
+        if offset + SESSION_RECORD.size + length > end:
+            return False
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            return False
+        if kind == RECORD_FRAME:
+            return length == self.frame_w * self.frame_h
+        elif kind == RECORD_FACES:
+            return length % 16 == 0
+        elif kind == RECORD_TARGET:
+            return length == struct.calcsize('<?ddd')
+        elif kind == RECORD_COMMAND:
+            return (length == struct.calcsize('<Bi') and
+                    ord(self.map[offset + SESSION_RECORD.size]) < len(LAUNCHER_COMMANDS))
+        return False
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # index of the first record at or after the given number of seconds into the session
+    def seek(self, seconds):
+        return bisect.bisect_left(self.timestamps, self.start_time + seconds)
+
+    # returns (seconds into the session, record kind, decoded record) for the record at index
+    def read(self, index):
+        kind, timestamp, length = SESSION_RECORD.unpack_from(self.map, self.offsets[index])
+        offset = self.offsets[index] + SESSION_RECORD.size
+        if kind == RECORD_FRAME:
+            value = numpy.frombuffer(self.map, numpy.uint8, length, offset).reshape(self.frame_h, self.frame_w)
+        elif kind == RECORD_FACES:
+            flat = struct.unpack_from('<%di' % (length // 4), self.map, offset)
+            value = [list(flat[i:i+4]) for i in range(0, len(flat), 4)]
+        elif kind == RECORD_TARGET:
+            value = struct.unpack_from('<?ddd', self.map, offset)
+        else:
+            code, arg = struct.unpack_from('<Bi', self.map, offset)
+            value = (LAUNCHER_COMMANDS[code], arg)
+        return timestamp - self.start_time, kind, value
+
+    def records(self, seconds=0):
+        for index in xrange(self.seek(seconds), len(self)):
+            yield self.read(index)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+# Stands in for Camera during replay, passing recorded frames to face_detect
+class ReplayCamera(Camera):
+    def __init__(self, opts):
+        self.opts = opts
+        self.current_image_viewer = None
+        self.resolution_set = False  # recorded frames are scaled back up to the original image dimensions
+        self.load_filters()
+        self.recorder = None
+        self.currentFrameLock = threading.Lock()
+        self.new_frame_available = False
+
+    def load_frame(self, frame):
+        self.current_frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        self.new_frame_available = True
+
+    def dispose(self):
+        pass
+
+
+# Stands in for the launcher during replay, with the calibration of the launcher that was recorded
+class ReplayLauncher(Launcher):
+    def __init__(self, session):
+        self.missile_capacity = 1
+        self.x_speed, self.y_speed = session.x_speed, session.y_speed
+        self.LEFT, self.RIGHT, self.UP, self.DOWN = session.LEFT, session.RIGHT, session.UP, session.DOWN
+
+    def center(self, x_origin=0.5, y_origin=0.5):
+        pass
+
+    def ledOff(self):
+        pass
+
+
+# replays a recorded session through face detection and aiming as fast as possible,
+# alongside what was recorded at the time
+def replay(opts):
+    session = SessionReader(opts.replay)
+    opts.image_dimensions = session.image_dimensions
+    camera = ReplayCamera(opts)
+    turret = Turret(opts, launcher=ReplayLauncher(session))
+
+    for seconds, kind, value in session.records(float(opts.replay_start)):
+        if kind == RECORD_FRAME:
+            camera.load_frame(value)
+            face_detected, x_adj, y_adj, face_y_size = camera.face_detect()
+            if not opts.no_display:
+                camera.display()
+            print "%.3f replayed target: %s x=%.6f y=%.6f size=%.6f" % (seconds, face_detected, x_adj, y_adj, face_y_size)
+            if turret.is_locked_on(x_adj, y_adj, face_detected):
+                print "%.3f replayed: locked on" % seconds
+            elif face_detected:
+                print "%.3f replayed adjustment: %s" % (seconds, turret.plan_adjust(x_adj, y_adj))
+        elif kind == RECORD_FACES:
+            print "%.3f recorded faces: %s" % (seconds, value)
+        elif kind == RECORD_TARGET:
+            print "%.3f recorded target: %s x=%.6f y=%.6f size=%.6f" % ((seconds,) + value)
+        else:
+            print "%.3f recorded command: %s(%d)" % ((seconds,) + value)
+    session.close()
+
+if __name__ == '__main__':
     # command-line options
     parser = OptionParser()
     parser.add_option("-l", "--launcher", dest="launcherID", default="2123",
@@ -612,6 +920,14 @@ if __name__ == '__main__':
                       help="direction to point initially - an x and y decimal percentage. Default: 0.5,0.5", metavar="X,Y")    
     parser.add_option("-p", "--profile", action="store_true", dest="profile", default=False,
                       help="enable detection of facial side views - better detection but slower")
+    parser.add_option("--record", dest="record", default=None,
+                      help="record the session to FILE for later analysis", metavar="FILE")
+    parser.add_option("--record-size", dest="record_size", default='256',
+                      help="space preallocated for the session recording. Default: 256", metavar="MB")
+    parser.add_option("--replay", dest="replay", default=None,
+                      help="replay a recorded session through face detection and aiming", metavar="FILE")
+    parser.add_option("--replay-start", dest="replay_start", default='0',
+                      help="seconds into the recorded session to start replaying from. Default: 0", metavar="SECONDS")
     opts, args = parser.parse_args()
     print opts
 
@@ -620,51 +936,68 @@ if __name__ == '__main__':
     opts.haar_file = 'haarcascade_frontalface_default.xml'
     opts.haar_profile_file = 'haarcascade_profileface.xml'
 
-    turret = Turret(opts)
-    camera = Camera(opts)
-    turretCentered = True
-
-    while (not camera.new_frame_available):
-        time.sleep(.001)   #wait for first frame to be captured
-    if not opts.reset_only:
-        while True:
-            try:
-                start_time = time.time()
-                face_detected, x_adj, y_adj, face_y_size = camera.face_detect()
-                detection_time = time.time()
+    if opts.replay:
+        replay(opts)
+        sys.exit()
 
-                if not opts.no_display:
-                    camera.display()
-
-                trackingDuration = turret.updateTrackingDuration(face_detected)
+    if (sys.platform == 'linux2' or sys.platform == 'darwin') and not os.geteuid() == 0:
+        sys.exit("Script must be run as root.")
 
-                #if target is already centered in sights take the shot
-                turret.ready_aim_fire(x_adj, y_adj, face_y_size, face_detected, camera) 
+    recorder = None
+    if opts.record:
+        recorder = Recorder(opts.record, int(opts.record_size) * 1024 * 1024, opts.image_dimensions)
+
+    # close the recorder however we exit, to trim the unused preallocated space
+    try:
+        turret = Turret(opts, recorder=recorder)
+        camera = Camera(opts)
+        camera.recorder = recorder
+        turretCentered = True
+
+        while (not camera.new_frame_available):
+            time.sleep(.001)   #wait for first frame to be captured
+        if not opts.reset_only:
+            while True:
+                try:
+                    start_time = time.time()
+                    face_detected, x_adj, y_adj, face_y_size = camera.face_detect()
+                    detection_time = time.time()
+
+                    if not opts.no_display:
+                        camera.display()
+
+                    trackingDuration = turret.updateTrackingDuration(face_detected)
+
+                    #if target is already centered in sights take the shot
+                    turret.ready_aim_fire(x_adj, y_adj, face_y_size, face_detected, camera) 
                
-                if face_detected:  
-                    #face detected: move turret to track         
-                    if opts.verbose:
-                        print "adjusting turret: x=" + str(x_adj) + ", y=" + str(y_adj)
-                    turret.adjust(x_adj, y_adj)
-                    turretCentered=False
-                elif (opts.mode=="guard") and (trackingDuration < -10) and (not turretCentered):
-                    #If turret is in guard mode and has lost track of its target it should reset to the position it is guarding
-                    turret.center()
-                    turretCentered=True
-                elif(opts.mode=="sweep") and (trackingDuration < -3):
-                    turret.sweep()
-
-
-                movement_time = time.time()
-                camera.new_frame_available = False #force camera to obtain next image after movement has completed
-
-                if opts.verbose:
-                    print "total time: " + str(movement_time - start_time)
-                    print "detection time: " + str(detection_time - start_time)
-                    print "movement time: " + str(movement_time - detection_time)
+                    if face_detected:  
+                        #face detected: move turret to track         
+                        if opts.verbose:
+                            print "adjusting turret: x=" + str(x_adj) + ", y=" + str(y_adj)
+                        turret.adjust(x_adj, y_adj)
+                        turretCentered=False
+                    elif (opts.mode=="guard") and (trackingDuration < -10) and (not turretCentered):
+                        #If turret is in guard mode and has lost track of its target it should reset to the position it is guarding
+                        turret.center()
+                        turretCentered=True
+                    elif(opts.mode=="sweep") and (trackingDuration < -3):
+                        turret.sweep()
+
+
+                    movement_time = time.time()
+                    camera.new_frame_available = False #force camera to obtain next image after movement has completed
 
-
-            except KeyboardInterrupt:
-                turret.dispose()
-                camera.dispose()
-                break
+                    if opts.verbose:
+                        print "total time: " + str(movement_time - start_time)
+                        print "detection time: " + str(detection_time - start_time)
+                        print "movement time: " + str(movement_time - detection_time)
+
+
+                except KeyboardInterrupt:
+                    turret.dispose()
+                    camera.dispose()
+                    break
+    finally:
+        if recorder:
+            recorder.close()